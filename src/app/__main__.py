@@ -5,7 +5,9 @@ Handles CLI arguments and orchestrates the agent execution.
 import sys
 import os
 import argparse
+import logging
 from app.agents import READMEAgent
+from app.config import DEFAULT_RPM
 
 def main():
     """
@@ -16,8 +18,19 @@ def main():
     parser.add_argument("directory_path", help="Path to the directory to analyze.")
     parser.add_argument("--dry-run", action="store_true", help="Run without calling the LLM to see context and file summary.")
     parser.add_argument("--max-chars", type=int, default=5000, help="Maximum characters per file to read (default: 5000).")
+    parser.add_argument("--local", action=argparse.BooleanOptionalAction, default=None, help="Generate the README locally without the LLM. By default this happens only for very small projects; --no-local always uses the LLM.")
+    parser.add_argument("--max-files", type=int, default=200, help="Maximum number of files to read, most informative first (default: 200).")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the on-disk cache of file contents and responses.")
+    parser.add_argument("--rpm", type=int, default=DEFAULT_RPM, help=f"Maximum Gemini requests per minute, 0 to disable (default: {DEFAULT_RPM}).")
+    parser.add_argument("--token-budget", type=int, default=20000, help="Approximate token budget for the LLM context (default: 20000).")
     
     args = parser.parse_args()
+    if args.max_files < 1:
+        parser.error("--max-files must be at least 1")
+    
+    # Configure logging only here, and only if the host application has not already configured logging
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     
     project_path = args.directory_path
     if not os.path.exists(project_path):
@@ -30,11 +43,13 @@ def main():
 
     try:
         # Initialize with the path and the max_chars
-        agent = READMEAgent(project_path, max_chars_per_file=args.max_chars)
+        agent = READMEAgent(project_path, max_chars_per_file=args.max_chars, token_budget=args.token_budget, use_cache=not args.no_cache, rpm=args.rpm, max_files=args.max_files, local=args.local)
         
-        # Call the 'generate' method we just added
-        result = agent.generate(dry_run=args.dry_run)
-        print(result)
+        # Stream the README to the terminal as it is generated
+        for chunk in agent.generate_stream(dry_run=args.dry_run):
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+        sys.stdout.write("\n")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
         sys.exit(1)
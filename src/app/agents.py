@@ -1,33 +1,65 @@
 import os
+import re
+import ast
+import sys
 import logging
-import time
-from google import genai
-from app.config import MODEL_NAME
+from typing import Iterator, Optional
+from app.config import DEFAULT_RPM, LOCAL_CONTEXT_THRESHOLD, MAX_OUTPUT_TOKENS, MODEL_NAME
 # Connects to your file-scanning logic
-from app.tools import generate_directory_tree, get_file_summaries 
+from app.tools import scan_project
+from app.compression import TREE_BUDGET_FRACTION, compress_context, compress_tree, count_tokens, format_file_block
+from app.cache import ProjectCache
+from app.ratelimit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
 class READMEAgent:
-    def __init__(self, project_path: str, max_chars_per_file: int = 5000):
-        # 1. Setup API Access
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable not set. Please set it in your terminal.")
-        
-        self.client = genai.Client(api_key=api_key)
+    def __init__(self, project_path: str, max_chars_per_file: int = 5000, token_budget: int = 20000, use_cache: bool = True, rpm: int = DEFAULT_RPM, max_files: int = 200, local: Optional[bool] = None):
+        # 1. Setup API Access (checked on first LLM use, so local runs need no key)
+        self._api_key = os.getenv("GEMINI_API_KEY")
+        self._client = None
         self.project_path = project_path
         self.max_chars_per_file = max_chars_per_file
+        self.token_budget = token_budget
+        self.max_files = max_files
+        self.cache = ProjectCache(project_path) if use_cache else None
+        self.rate_limiter = RateLimiter(rpm)
+        # True: always local, False: always the LLM, None: local for very small projects
+        self.local = local
+
+    @property
+    def client(self):
+        """
+        The Gemini client, created on first use.
+        The SDK is imported and the API key checked here, so dry runs, local runs
+        and cached runs need neither.
+        """
+        if self._client is None:
+            if not self._api_key:
+                raise ValueError("GEMINI_API_KEY environment variable not set. Please set it in your terminal.")
+            from google import genai
+            self._client = genai.Client(api_key=self._api_key)
+        return self._client
 
-    def _get_context(self) -> str:
+    def _gather(self) -> tuple[str, list]:
         """Uses tools.py to build a comprehensive view of your project."""
-        logger.info(f"Gathering project context...")
-        
-        # Get the visual structure
-        tree = generate_directory_tree(self.project_path)
-        # Get the actual code snippets
-        summaries = get_file_summaries(self.project_path, self.max_chars_per_file)
+        logger.info("Gathering project context...")
         
+        # Get the visual structure and the actual code snippets in one pass
+        tree, summaries = scan_project(
+            self.project_path, self.max_chars_per_file, cache=self.cache, max_files=self.max_files
+        )
+        if self.cache is not None:
+            self.cache.save()
+        # The tree gets at most a fixed share of the budget, so file contents always get the rest
+        tree = compress_tree(tree, int(self.token_budget * TREE_BUDGET_FRACTION))
+        # Files get what is left after the tree and the fixed context headings
+        overhead = count_tokens(self._get_context(tree, []))
+        summaries = compress_context(summaries, max(0, self.token_budget - overhead))
+        return tree, summaries
+
+    def _get_context(self, tree: str, summaries: list) -> str:
+        """Formats the tree and file summaries into the prompt context."""
         context_parts = [
             "# Project Directory Tree",
             "```",
@@ -35,39 +67,228 @@ class READMEAgent:
             "```",
             "\n# File Contents"
         ]
-        
-        for summary in summaries:
-            context_parts.append(f"## File: {summary.relative_path}")
-            context_parts.append(f"```\n{summary.content}\n```")
+        context_parts.extend(format_file_block(summary) for summary in summaries)
             
         return "\n".join(context_parts)
 
-    def generate(self, dry_run: bool = False) -> str:
-        """The main method called by __main__.py to create the README."""
-        context = self._get_context()
+    def generate_stream(self, dry_run: bool = False) -> Iterator[str]:
+        """
+        Creates the README, yielding its text in chunks as the model produces them.
+        Used by __main__.py so output starts appearing before generation finishes.
+        """
+        tree, summaries = self._gather()
+        context = self._get_context(tree, summaries)
         
         if dry_run:
-            return f"--- DRY RUN COMPLETE ---\nReview the gathered context above. No LLM was called."
+            yield f"--- DRY RUN COMPLETE ---\nReview the gathered context above. No LLM was called."
+            return
+
+        # Tiny Python projects get a templated README; a Gemini round-trip is not worth it.
+        # The template only understands Python, so other projects need --local explicitly.
+        auto_local = (
+            self.local is None
+            and len(context) < LOCAL_CONTEXT_THRESHOLD
+            and any(summary.extension == ".py" for summary in summaries)
+        )
+        if self.local or auto_local:
+            logger.info("Generating README locally, no LLM call")
+            yield LocalREADMEGenerator(self.project_path, tree, summaries).generate()
+            return
+
+        prompt = (
+            "Act as a professional software engineer. Based on the following "
+            "project tree and file contents, generate a high-quality, "
+            "comprehensive README.md in Markdown format. Include installation, "
+            "usage, and a tech stack section.\n\n"
+            f"{context}"
+        )
+        
+        # An unchanged project and prompt gets the previous README back instantly
+        cache_key = ProjectCache.response_key(MODEL_NAME, MAX_OUTPUT_TOKENS, prompt)
+        if self.cache is not None:
+            cached = self.cache.get_response(cache_key)
+            if cached is not None:
+                logger.info("Using cached README for unchanged context")
+                yield cached
+                return
+
+        # Raises before any waiting if the API key is missing
+        client = self.client
 
         try:
-            # 🛑 IMPORTANT: 12s delay to stay under Free Tier 5-Requests-Per-Minute limit
-            print("Respecting API Quota: Waiting 12s cooldown...")
-            time.sleep(12)
+            # 🛑 IMPORTANT: Only waits when the requests-per-minute budget is used up
+            self.rate_limiter.acquire()
             
-            prompt = (
-                "Act as a professional software engineer. Based on the following "
-                "project tree and file contents, generate a high-quality, "
-                "comprehensive README.md in Markdown format. Include installation, "
-                "usage, and a tech stack section.\n\n"
-                f"{context}"
-            )
-            
-            response = self.client.models.generate_content(
+            chunks = []
+            finish_reason = None
+            for chunk in client.models.generate_content_stream(
                 model=MODEL_NAME,
-                contents=prompt
-            )
-            return response.text
+                contents=prompt,
+                config={"max_output_tokens": MAX_OUTPUT_TOKENS}
+            ):
+                if chunk.candidates and chunk.candidates[0].finish_reason:
+                    finish_reason = chunk.candidates[0].finish_reason
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+
+            # A README cut off at MAX_OUTPUT_TOKENS must not be replayed on every later run
+            truncated = getattr(finish_reason, "name", finish_reason) == "MAX_TOKENS"
+            if truncated:
+                logger.warning("README was cut off at %d output tokens and will not be cached", MAX_OUTPUT_TOKENS)
+            if self.cache is not None and chunks and not truncated:
+                self.cache.put_response(cache_key, "".join(chunks))
+                self.cache.save()
 
         except Exception as e:
-            logger.error(f"LLM Generation failed: {str(e)}")
-            return f"An error occurred while generating the README: {str(e)}"
\ No newline at end of file
+            logger.error("LLM Generation failed: %s", e)
+            yield f"An error occurred while generating the README: {str(e)}"
+
+    def generate(self, dry_run: bool = False) -> str:
+        """Creates the README and returns it as a single string."""
+        return "".join(self.generate_stream(dry_run=dry_run))
+
+# Matches the usual script guard with either quote style
+_MAIN_GUARD_RE = re.compile(r"""^if\s+__name__\s*==\s*['"]__main__['"]\s*:""", re.MULTILINE)
+# Distribution name at the start of a requirement line, e.g. "pydantic" in "pydantic==2.0"
+_REQUIREMENT_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+class LocalREADMEGenerator:
+    """
+    Builds a README from the project itself, without calling an LLM.
+
+    Extracts the project name and metadata (pyproject.toml, setup.py), module
+    docstrings, entry points and third-party imports, and fills a fixed template.
+    """
+    def __init__(self, project_path: str, tree: str, summaries: list):
+        self.project_path = project_path
+        self.tree = tree
+        self.summaries = summaries
+
+    def _metadata(self) -> dict:
+        """Reads name, description and dependencies from pyproject.toml or setup.py."""
+        metadata = {}
+        try:
+            import tomllib
+            with open(os.path.join(self.project_path, "pyproject.toml"), "rb") as f:
+                pyproject = tomllib.load(f)
+            project = pyproject.get("project") or pyproject.get("tool", {}).get("poetry", {})
+            for key in ("name", "description"):
+                if isinstance(project.get(key), str):
+                    metadata[key] = project[key]
+            if isinstance(project.get("dependencies"), list):
+                metadata["dependencies"] = project["dependencies"]
+        except (ImportError, OSError, ValueError):
+            pass
+
+        setup = next((s for s in self.summaries if s.path == "setup.py"), None)
+        if setup is not None:
+            try:
+                tree = ast.parse(setup.content)
+            except SyntaxError:
+                return metadata
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Call) and getattr(node.func, "id", getattr(node.func, "attr", None)) == "setup":
+                    for kw in node.keywords:
+                        if kw.arg in ("name", "description") and isinstance(kw.value, ast.Constant):
+                            metadata.setdefault(kw.arg, str(kw.value.value))
+                        elif kw.arg == "install_requires" and isinstance(kw.value, (ast.List, ast.Tuple)):
+                            metadata.setdefault("dependencies", [
+                                elt.value for elt in kw.value.elts
+                                if isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+                            ])
+        return metadata
+
+    def generate(self) -> str:
+        """Returns the README as a Markdown string."""
+        metadata = self._metadata()
+        name = metadata.get("name") or os.path.basename(os.path.abspath(self.project_path))
+
+        modules = []
+        entry_points = []
+        imports = set()
+        local_names = set()
+        for summary in self.summaries:
+            if summary.extension != ".py":
+                continue
+            local_names.update(part.removesuffix(".py") for part in summary.path.split(os.sep))
+            try:
+                module = ast.parse(summary.content)
+            except SyntaxError:
+                # Truncated or invalid source; nothing reliable to extract
+                modules.append((summary.path, ""))
+                continue
+            docstring = ast.get_docstring(module) or ""
+            modules.append((summary.path, docstring.strip().split("\n\n")[0].replace("\n", " ")))
+            if os.path.basename(summary.path) == "__main__.py" or _MAIN_GUARD_RE.search(summary.content):
+                entry_points.append(summary.path)
+            for node in ast.walk(module):
+                if isinstance(node, ast.Import):
+                    imports.update(alias.name.split(".")[0] for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                    imports.add(node.module.split(".")[0])
+
+        paths = {summary.path for summary in self.summaries}
+        has_pyproject = os.path.exists(os.path.join(self.project_path, "pyproject.toml"))
+
+        # Declared dependencies use installable names (PyYAML, not yaml), so they are
+        # preferred; import names are only a fallback and are never mixed with them
+        requirements = next((s for s in self.summaries if s.path == "requirements.txt"), None)
+        declared_lines = list(metadata.get("dependencies", []))
+        if requirements is not None:
+            declared_lines += requirements.content.splitlines()
+        declared = {}
+        for requirement in declared_lines:
+            package = _REQUIREMENT_NAME_RE.match(requirement.strip())
+            if package:
+                declared.setdefault(package.group(0).lower(), package.group(0))
+        declared = sorted(declared.values(), key=str.lower)
+        imported = sorted(imports - set(sys.stdlib_module_names) - local_names)
+        dependencies = declared or imported
+
+        lines = [f"# {name}", ""]
+        description = metadata.get("description") or (f"{name} is a Python project." if modules else "")
+        if description:
+            lines += [description, ""]
+
+        lines += ["## Project Structure", "", "```", self.tree, "```", ""]
+
+        if modules:
+            lines += ["## Modules", ""]
+            lines += [f"- `{path}`" + (f": {doc}" if doc else "") for path, doc in modules]
+            lines.append("")
+
+        stack = (["Python"] if modules else []) + dependencies
+        if stack:
+            lines += ["## Tech Stack", ""]
+            lines += [f"- {item}" for item in stack]
+            lines.append("")
+
+        # Only a manifest gives a command that is safe to run; import names
+        # often differ from the package to install (yaml vs PyYAML)
+        if "requirements.txt" in paths:
+            lines += ["## Installation", "", "```bash", "pip install -r requirements.txt", "```", ""]
+        elif "setup.py" in paths or has_pyproject:
+            lines += ["## Installation", "", "```bash", "pip install .", "```", ""]
+        elif imported:
+            lines += ["## Installation", ""]
+            lines += ["No dependency manifest was found. The code imports these third-party modules:", ""]
+            lines += [f"- `{module}`" for module in imported]
+            lines.append("")
+        elif modules:
+            lines += ["## Installation", "", "No third-party dependencies.", ""]
+
+        if entry_points:
+            lines += ["## Usage", "", "```bash"]
+            for path in entry_points:
+                if os.path.basename(path) == "__main__.py" and os.sep in path:
+                    package = os.path.dirname(path).split(os.sep)
+                    # In a src layout, src itself is the import root
+                    if package[0] == "src" and len(package) > 1:
+                        package = package[1:]
+                    lines.append(f"python -m {'.'.join(package)}")
+                else:
+                    lines.append(f"python {path}")
+            lines += ["```", ""]
+
+        return "\n".join(lines)
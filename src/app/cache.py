@@ -0,0 +1,95 @@
+"""
+On-disk cache for the Project README Generation Agent.
+Stores truncated file contents keyed by (path, mtime, size) and LLM responses
+keyed by a hash of the prompt, so repeated runs on an unchanged project skip the work.
+"""
+import os
+import json
+import hashlib
+import logging
+from typing import Optional
+from app.config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Number of LLM responses kept per project
+MAX_RESPONSES = 8
+
+class ProjectCache:
+    """
+    JSON cache for a single project, stored at CACHE_DIR/<project_hash>.json.
+
+    Only file entries looked up during the current run are written back,
+    so deleted or excluded files do not accumulate.
+    """
+    def __init__(self, project_path: str):
+        project_root = os.path.abspath(project_path)
+        digest = hashlib.sha256(project_root.encode("utf-8")).hexdigest()[:16]
+        self.cache_file = os.path.join(CACHE_DIR, f"{digest}.json")
+
+        data = self._load()
+        self._files = data.get("files", {})
+        self._responses = data.get("responses", {})
+        self._seen = set()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache %s: %s", self.cache_file, e)
+            return {}
+
+    def get_file(self, path: str, st: os.stat_result, max_chars: int):
+        """Returns (hit, content) for a file; content may be None for unreadable files."""
+        self._seen.add(path)
+        entry = self._files.get(path)
+        if (
+            entry is not None
+            and entry["mtime_ns"] == st.st_mtime_ns
+            and entry["size"] == st.st_size
+            and entry["max_chars"] == max_chars
+        ):
+            return True, entry["content"]
+        return False, None
+
+    def put_file(self, path: str, st: os.stat_result, max_chars: int, content: Optional[str]):
+        self._seen.add(path)
+        self._files[path] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "max_chars": max_chars,
+            "content": content,
+        }
+
+    @staticmethod
+    def response_key(model: str, max_output_tokens: int, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\n{max_output_tokens}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def get_response(self, key: str) -> Optional[str]:
+        return self._responses.get(key)
+
+    def put_response(self, key: str, text: str):
+        self._responses.pop(key, None)
+        self._responses[key] = text
+        # Dicts keep insertion order, so the oldest responses come first
+        while len(self._responses) > MAX_RESPONSES:
+            del self._responses[next(iter(self._responses))]
+
+    def save(self):
+        """Writes the cache atomically; failures are logged and otherwise ignored."""
+        data = {
+            "files": {path: self._files[path] for path in self._seen if path in self._files},
+            "responses": self._responses,
+        }
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning("Could not write cache %s: %s", self.cache_file, e)
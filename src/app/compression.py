@@ -0,0 +1,218 @@
+"""
+Token-budget-aware compression of the gathered file context.
+Keeps the most informative files verbatim and prunes low-signal lines from the rest
+so the prompt stays within a fixed token budget.
+"""
+import os
+import re
+import logging
+from dataclasses import replace
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Files that describe the project as a whole
+_MANIFEST_NAMES = {"pyproject.toml", "setup.py", "setup.cfg", "package.json"}
+_ENTRY_NAMES = {"__main__.py", "__init__.py"}
+# file_priority scores for ordinary Python modules and for everything else
+PY_MODULE_PRIORITY = 5
+DEFAULT_PRIORITY = 2
+
+# Full-line '#' comments, only stripped where '#' really starts a comment
+# (not CSS id selectors, JS private fields or Markdown headings)
+_COMMENT_RE = re.compile(r"^\s*#")
+_HASH_COMMENT_EXTENSIONS = {".py", ".yml", ".yaml", ".txt", ".toml", ".cfg"}
+# Long base64/hex-like runs: embedded data, hashes, minified blobs
+_BLOB_RE = re.compile(r"[A-Za-z0-9+/=_-]{80,}")
+
+# Code fence language hints by file extension
+_FENCE_LANG = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".md": "markdown",
+    ".json": "json",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+    ".html": "html",
+    ".css": "css",
+    ".java": "java",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".txt": "",
+    ".toml": "toml",
+    ".cfg": "ini",
+}
+
+# Appended to file contents cut to fit the budget, as tools.read_file_content does
+_TRUNCATION_MARKER = "\n... [Content Truncated] ..."
+# Below this many tokens, the head of a file is not worth including
+MIN_FILE_TOKENS = 32
+# Largest share of the token budget the directory tree may use
+TREE_BUDGET_FRACTION = 0.25
+# Indentation units used by tools.generate_directory_tree, one per level
+_TREE_INDENTS = ("    ", "│   ")
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Loads the tiktoken encoding once, or returns None if it is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        logger.warning("tiktoken unavailable, estimating tokens as characters / 4")
+        return None
+
+def count_tokens(text: str) -> int:
+    """Counts tokens with cl100k_base, which is close enough to Gemini's tokenizer."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Returns the longest head of text that is at most max_tokens tokens."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max(0, max_tokens - 1) * 4]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+def file_priority(path: str) -> int:
+    """Scores how much a file tells about the project; higher is more important."""
+    name = os.path.basename(path).lower()
+    if name.startswith("readme") or name.startswith("requirements") or name in _MANIFEST_NAMES:
+        return 10
+    if name in _ENTRY_NAMES:
+        return 8
+    if name.endswith(".py"):
+        return PY_MODULE_PRIORITY
+    return DEFAULT_PRIORITY
+
+def prune_content(path: str, content: str) -> str:
+    """Drops blank lines, full-line comments and long encoded blobs."""
+    strip_comments = os.path.splitext(path)[1].lower() in _HASH_COMMENT_EXTENSIONS
+    lines = []
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        if strip_comments and _COMMENT_RE.match(line):
+            continue
+        lines.append(_BLOB_RE.sub("[...]", line))
+    return "\n".join(lines)
+
+def format_file_block(summary) -> str:
+    """Renders one file as it appears in the prompt: a heading and a fenced code block."""
+    return f"## File: {summary.path}\n```{_FENCE_LANG.get(summary.extension, '')}\n{summary.content}\n```"
+
+def _block_tokens(summary) -> int:
+    # +1 for the newline that joins blocks in the prompt
+    return count_tokens(format_file_block(summary)) + 1
+
+def _tree_depth(line: str) -> int:
+    depth = 0
+    while line[depth * 4:depth * 4 + 4] in _TREE_INDENTS:
+        depth += 1
+    return depth
+
+def _collapse_tree(lines: list, depths: list, max_depth: int) -> list:
+    """Replaces the entries deeper than max_depth with one '… N more entries' line per directory."""
+    collapsed = []
+    hidden = 0
+    hidden_indent = ""
+    for line, depth in zip(lines, depths):
+        if depth > max_depth:
+            if not hidden:
+                hidden_indent = line[:(max_depth + 1) * 4]
+            hidden += 1
+            continue
+        if hidden:
+            collapsed.append(f"{hidden_indent}└── … {hidden} more entries")
+            hidden = 0
+        collapsed.append(line)
+    if hidden:
+        collapsed.append(f"{hidden_indent}└── … {hidden} more entries")
+    return collapsed
+
+def compress_tree(tree: str, budget_tokens: int) -> str:
+    """
+    Fits a directory tree from tools.generate_directory_tree into budget_tokens.
+
+    Deeper levels are collapsed into '… N more entries' lines, one level at a
+    time, until the tree fits. If even the top level is too long, it is cut
+    after as many entries as fit.
+    """
+    if count_tokens(tree) <= budget_tokens:
+        return tree
+
+    lines = tree.split("\n")
+    depths = [_tree_depth(line) for line in lines]
+    for max_depth in range(max(depths) - 1, -1, -1):
+        collapsed = _collapse_tree(lines, depths, max_depth)
+        if count_tokens("\n".join(collapsed)) <= budget_tokens:
+            return "\n".join(collapsed)
+
+    top_level = [line for line, depth in zip(lines, depths) if depth == 0]
+    kept = []
+    # Room for the closing '… N more entries' line
+    used = count_tokens(f"└── … {len(top_level)} more entries")
+    for line in top_level:
+        used += count_tokens(line) + 1
+        if used > budget_tokens:
+            break
+        kept.append(line)
+    kept.append(f"└── … {len(top_level) - len(kept)} more entries")
+    logger.info("Directory tree cut to %d of %d top-level entries", len(kept) - 1, len(top_level))
+    return "\n".join(kept)
+
+def compress_context(summaries: list, budget_tokens: int = 20000) -> list:
+    """
+    Fits the file summaries into budget_tokens.
+
+    Each file is costed as its rendered block (format_file_block), so the
+    heading and code fences count against the budget too. If everything already fits, the summaries are returned unchanged. Otherwise
+    files are taken greedily by priority. A file that does not fit verbatim is
+    pruned, and if that is still too long its head is cut to what is left of the
+    budget, before any lower-priority file is considered. Files are only dropped
+    once fewer than MIN_FILE_TOKENS remain. The kept summaries are returned in
+    their original order.
+    """
+    costs = [_block_tokens(summary) for summary in summaries]
+    if sum(costs) <= budget_tokens:
+        return summaries
+
+    order = sorted(
+        range(len(summaries)),
+        key=lambda i: -file_priority(summaries[i].path)
+    )
+
+    kept = {}
+    remaining = budget_tokens
+    marker_tokens = count_tokens(_TRUNCATION_MARKER)
+    for i in order:
+        summary = summaries[i]
+        if costs[i] <= remaining:
+            kept[i] = summary
+            remaining -= costs[i]
+            continue
+
+        # Shrink this file now, so lower-priority files cannot take its budget
+        shrunk = replace(summary, content=prune_content(summary.path, summary.content))
+        cost = _block_tokens(shrunk)
+        if cost > remaining:
+            header_tokens = _block_tokens(replace(summary, content=""))
+            if remaining - header_tokens < MIN_FILE_TOKENS:
+                continue
+            # Two tokens of slack for merges at the cut and around the marker
+            head = truncate_to_tokens(shrunk.content, remaining - header_tokens - marker_tokens - 2)
+            shrunk = replace(summary, content=head + _TRUNCATION_MARKER)
+            cost = _block_tokens(shrunk)
+            if cost > remaining:
+                continue
+        kept[i] = shrunk
+        remaining -= cost
+
+    dropped = len(summaries) - len(kept)
+    logger.info("Compressed context to %d tokens, dropped %d files", budget_tokens - remaining, dropped)
+    return [kept[i] for i in sorted(kept)]
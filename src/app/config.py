@@ -3,11 +3,32 @@ import os
 # Model name for the generation
 MODEL_NAME = "gemini-2.0-flash"
 
+# Upper bound on the length of the generated README, to bound cost
+MAX_OUTPUT_TOKENS = 4096
+
+# Below this many characters of context, the README is generated locally without the LLM
+LOCAL_CONTEXT_THRESHOLD = 8 * 1024
+
+# Requests per minute allowed by the Gemini Free Tier
+DEFAULT_RPM = 5
+
+# Where file contents and LLM responses are cached between runs
+CACHE_DIR = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "nasikoai")
+
+# Files larger than this (in bytes) are skipped without being read
+MAX_FILE_SIZE = 256 * 1024
+
+# Files larger than this (in bytes) are memory-mapped instead of read
+MMAP_THRESHOLD = 64 * 1024
+
+# Leading bytes checked for NUL to detect binary files
+BINARY_PROBE_BYTES = 8192
+
 # Missing variable that caused your error
-SUPPORTED_EXTENSIONS = [".py", ".md", ".txt", ".json", ".yml", ".yaml", ".html", ".css", ".js"]
+SUPPORTED_EXTENSIONS: frozenset[str] = frozenset({".py", ".md", ".txt", ".json", ".yml", ".yaml", ".html", ".css", ".js", ".toml", ".cfg"})
 
 # Folders and files to skip
-EXCLUSION_PATTERNS = [
+EXCLUSION_PATTERNS: frozenset[str] = frozenset({
     "__pycache__",
     ".git",
     "venv",
@@ -16,4 +37,4 @@ EXCLUSION_PATTERNS = [
     "*.pyc",
     "dist",
     "build"
-]
\ No newline at end of file
+})
\ No newline at end of file
@@ -1,28 +1,31 @@
 """
-Pydantic models for the Project README Generation Agent.
+Data models for the Project README Generation Agent.
 Defines the structure for file summaries and project maps.
 """
-from pydantic import BaseModel
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import List
 
-class FileSummary(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FileSummary:
     """
     Represents a summary of a single file.
     
     Attributes:
         path (str): The relative path to the file.
         extension (str): The file extension.
-        summary (Optional[str]): A brief summary or description of the file content.
-        content (Optional[str]): The actual content of the file (potentially truncated).
+        content (str): The actual content of the file (potentially truncated).
+        summary (str): A brief summary or description of the file content.
     """
     path: str
     extension: str
-    summary: Optional[str] = None
-    content: Optional[str] = None
+    content: str
+    summary: str = ""
 
-class ProjectMap(BaseModel):
+@dataclass(slots=True)
+class ProjectMap:
     """
     Represents the map of the entire project.
+    Use dataclasses.asdict if it needs to be serialized.
     
     Attributes:
         files (List[FileSummary]): A list of file summaries.
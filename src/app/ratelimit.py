@@ -0,0 +1,70 @@
+"""
+Rate limiting for Gemini API calls.
+Implements a token bucket whose state is persisted on disk, so the limit holds
+across separate runs of the CLI instead of sleeping before every call.
+"""
+import os
+import json
+import time
+import logging
+from typing import Optional
+from app.config import CACHE_DIR, DEFAULT_RPM
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """
+    Token bucket allowing `rpm` requests per minute.
+
+    The bucket holds up to `rpm` tokens and refills continuously. Its state
+    (`tokens` and `last_call_ts`) is stored in CACHE_DIR/ratelimit.json.
+    An rpm of 0 or less disables limiting.
+    """
+    def __init__(self, rpm: int = DEFAULT_RPM, state_file: Optional[str] = None):
+        self.rpm = rpm
+        self.state_file = state_file or os.path.join(CACHE_DIR, "ratelimit.json")
+
+    def _load(self) -> dict:
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, state: dict):
+        """Writes the state atomically, so an interrupted write cannot corrupt it."""
+        tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            logger.warning("Could not write rate limit state %s: %s", self.state_file, e)
+
+    def acquire(self):
+        """Blocks only as long as needed to take one token from the bucket."""
+        if self.rpm <= 0:
+            return
+
+        capacity = float(self.rpm)
+        rate = self.rpm / 60.0
+        now = time.time()
+        state = self._load()
+        try:
+            tokens = float(state.get("tokens", capacity))
+            last_call_ts = float(state.get("last_call_ts", now))
+        except (TypeError, ValueError):
+            tokens, last_call_ts = capacity, now
+
+        tokens = min(capacity, tokens + max(0.0, now - last_call_ts) * rate)
+        if tokens < 1:
+            wait = (1 - tokens) / rate
+            # Logged rather than printed: stdout carries the streamed README
+            logger.info("Respecting API Quota: Waiting %.1fs cooldown...", wait)
+            time.sleep(wait)
+            now = time.time()
+            tokens = 1.0
+
+        self._save({"tokens": tokens - 1, "last_call_ts": now})
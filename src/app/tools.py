@@ -1,55 +1,198 @@
 import os
-from pathlib import Path
-from dataclasses import dataclass
-from app.config import EXCLUSION_PATTERNS, SUPPORTED_EXTENSIONS
+import re
+import mmap
+import fnmatch
+import heapq
+import logging
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from app.cache import ProjectCache
+from app.models import FileSummary
+from app.compression import DEFAULT_PRIORITY, PY_MODULE_PRIORITY, file_priority
+from app.config import BINARY_PROBE_BYTES, EXCLUSION_PATTERNS, MAX_FILE_SIZE, MMAP_THRESHOLD, SUPPORTED_EXTENSIONS
 
-@dataclass
-class FileSummary:
-    relative_path: str
-    content: str
+# Extensions without the leading dot, for matching against str.rpartition
+SUPPORTED_EXTENSIONS_NODOT = frozenset(ext.lstrip(".") for ext in SUPPORTED_EXTENSIONS)
 
-def generate_directory_tree(root_path: str, indent: str = "") -> str:
+# One compiled pattern for all exclusions, so globs like "*.pyc" apply as well as plain names
+_EXCL_RE = re.compile("|".join(fnmatch.translate(p) for p in sorted(EXCLUSION_PATTERNS)))
+
+logger = logging.getLogger(__name__)
+
+def generate_directory_tree(root_path: str) -> str:
     """Generates a visual tree of the project structure."""
-    root = Path(root_path)
-    tree = []
+    parts = []
+    for _ in _walk(root_path, "", parts):
+        pass
+    return "\n".join(parts)
+
+def _walk(dir_path: str, indent: str, parts: Optional[list]):
+    """
+    Yields (path, stat_result) for the supported, non-excluded files under dir_path.
     
-    # Get sorted list of files/dirs, filtering out exclusions
-    items = sorted([item for item in root.iterdir() if item.name not in EXCLUSION_PATTERNS])
+    When parts is given, the directory tree lines are appended to it during the
+    same pass, so the tree and the file list cost a single scandir per directory.
+    Files over MAX_FILE_SIZE are pruned here from their DirEntry stat, before
+    anything is opened; the stat is passed on so readers need not repeat it.
+    """
+    # Bound to locals so the loop uses fast local lookups
+    is_excluded = _EXCL_RE.match
+    supported = SUPPORTED_EXTENSIONS_NODOT
+    max_size = MAX_FILE_SIZE
+    try:
+        with os.scandir(dir_path) as it:
+            # (name, is_dir, entry) tuples reuse the cached DirEntry type, no extra stat
+            items = sorted(
+                (entry.name, entry.is_dir(follow_symlinks=False), entry)
+                for entry in it
+                if not is_excluded(entry.name)
+            )
+    except OSError:
+        return
     
-    for i, item in enumerate(items):
-        is_last = (i == len(items) - 1)
-        connector = "└── " if is_last else "├── "
+    last = len(items) - 1
+    for i, (name, is_dir, entry) in enumerate(items):
+        is_last = (i == last)
+        if parts is not None:
+            connector = "└── " if is_last else "├── "
+            parts.append(f"{indent}{connector}{name}")
         
-        tree.append(f"{indent}{connector}{item.name}")
-        
-        if item.is_dir():
+        if is_dir:
             extension = "    " if is_last else "│   "
-            tree.append(generate_directory_tree(item, indent + extension))
-            
-    return "\n".join(tree)
+            yield from _walk(entry.path, indent + extension, parts)
+        else:
+            head, dot, ext = name.rpartition(".")
+            if head and ext in supported:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if st.st_size <= max_size:
+                    yield entry.path, st
 
-def get_file_summaries(root_path: str, max_chars: int) -> list:
-    """Recursively finds valid files and reads their content."""
-    summaries = []
-    root = Path(root_path)
+def read_file_content(file_path: str, max_chars: int, size: Optional[int] = None):
+    """
+    Reads at most max_chars characters from a file. Returns None if unreadable.
+    
+    Files over MAX_FILE_SIZE and files that look binary are skipped. Only the
+    first max_chars * 4 + 1 bytes are read (the worst case for UTF-8), so large
+    files are never loaded in full just to be truncated. Files over
+    MMAP_THRESHOLD are memory-mapped rather than read. Pass size when it is
+    already known to skip the stat call.
+    """
+    max_bytes = max_chars * 4
+    read_bytes = max(max_bytes + 1, BINARY_PROBE_BYTES)
+    try:
+        if size is None:
+            size = os.stat(file_path).st_size
+        if size > MAX_FILE_SIZE:
+            return None
+        with open(file_path, "rb") as f:
+            if size > MMAP_THRESHOLD:
+                # Slice the head straight out of the page cache, skipping the read buffer
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    raw = mm[:read_bytes]
+            else:
+                raw = f.read(read_bytes)
+    except (OSError, ValueError):
+        # Silently skip files that can't be read (ValueError: file emptied before mmap)
+        return None
+    
+    # A NUL byte near the start is the heuristic git and grep use for binary files
+    if b"\x00" in raw[:BINARY_PROBE_BYTES]:
+        return None
+    raw = raw[:max_bytes + 1]
+    
+    content = raw.decode("utf-8", errors="replace")
+    if len(raw) > max_bytes or len(content) > max_chars:
+        content = content[:max_chars] + "\n... [Content Truncated] ..."
+    return content
+
+def list_files(root_path: str):
+    """Yields (path, stat_result) for the supported, non-excluded files under root_path."""
+    yield from _walk(root_path, "", None)
+
+def select_files(root_path: str, files, max_files: Optional[int]):
+    """
+    Keeps at most max_files of the given files, most informative first.
+    
+    Files are ranked by compression.file_priority: README and manifests, then
+    __main__/__init__, then top-level Python modules. Everything else, deeper
+    Python modules included, follows by depth so shallower files win.
+    The selected files are returned in their original traversal order.
+    """
+    if max_files is None:
+        return files
     
-    for file_path in root.rglob("*"):
-        # Skip directories and excluded patterns
-        if file_path.is_dir() or any(part in EXCLUSION_PATTERNS for part in file_path.parts):
+    root_prefix = os.path.join(root_path, "")
+    def rank(item):
+        rel_path = item[1][0][len(root_prefix):]
+        depth = rel_path.count(os.sep)
+        priority = file_priority(rel_path)
+        if depth and priority == PY_MODULE_PRIORITY:
+            priority = DEFAULT_PRIORITY
+        return (-priority, depth, item[0])
+    
+    candidates = list(enumerate(files))
+    if len(candidates) > max_files:
+        logger.info("Limiting analysis to %d of %d files", max_files, len(candidates))
+    selected = heapq.nsmallest(max_files, candidates, key=rank)
+    return [file for _, file in sorted(selected)]
+
+def get_file_summaries(root_path: str, max_chars: int, cache: Optional[ProjectCache] = None, max_files: Optional[int] = None) -> list:
+    """
+    Recursively finds valid files and reads their content in parallel.
+    
+    If a cache is given, files whose mtime and size are unchanged are served
+    from it instead of being read again. If max_files is given, only that many
+    files are read, chosen by select_files.
+    """
+    files = select_files(root_path, list_files(root_path), max_files)
+    return _read_files(root_path, files, max_chars, cache)
+
+def scan_project(root_path: str, max_chars: int, cache: Optional[ProjectCache] = None, max_files: Optional[int] = None) -> tuple[str, list]:
+    """
+    Builds the directory tree and the file summaries in a single traversal.
+    
+    Equivalent to generate_directory_tree plus get_file_summaries, but every
+    directory is scanned only once.
+    """
+    parts = []
+    files = select_files(root_path, _walk(root_path, "", parts), max_files)
+    summaries = _read_files(root_path, files, max_chars, cache)
+    return "\n".join(parts), summaries
+
+def _read_files(root_path: str, files, max_chars: int, cache: Optional[ProjectCache]) -> list:
+    """Reads the given files in a thread pool and returns their FileSummary objects."""
+    # Walk paths are root_path joined with the relative path, so slicing recovers it
+    root_prefix = os.path.join(root_path, "")
+    
+    def read(file):
+        file_path, st = file
+        if cache is None:
+            return file_path, read_file_content(file_path, max_chars, st.st_size)
+        key = os.path.abspath(file_path)
+        hit, content = cache.get_file(key, st, max_chars)
+        if not hit:
+            content = read_file_content(file_path, max_chars, st.st_size)
+            cache.put_file(key, st, max_chars, content)
+        return file_path, content
+    
+    # Reads are IO-bound, so threads overlap the open/read syscalls. Results come
+    # back in the order of `files`. Without a max_files cap, `files` is the walk
+    # itself and reads start while it is still running; with a cap (the CLI
+    # default), select_files has already listed everything first.
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        results = list(ex.map(read, files))
+    
+    summaries = []
+    for file_path, content in results:
+        if content is None:
             continue
-            
-        # Only read supported file types (from config.py)
-        if file_path.suffix in SUPPORTED_EXTENSIONS:
-            try:
-                content = file_path.read_text(encoding="utf-8")
-                # Truncate to save tokens/characters
-                if len(content) > max_chars:
-                    content = content[:max_chars] + "\n... [Content Truncated] ..."
-                
-                rel_path = file_path.relative_to(root)
-                summaries.append(FileSummary(relative_path=str(rel_path), content=content))
-            except Exception as e:
-                # Silently skip files that can't be read (binary, encoding issues)
-                continue
+        rel_path = file_path[len(root_prefix):]
+        head, dot, ext = rel_path.rpartition(os.sep)[2].rpartition(".")
+        extension = dot + ext if head else ""
+        summaries.append(FileSummary(path=rel_path, extension=extension, content=content))
                 
-    return summaries
\ No newline at end of file
+    return summaries
@@ -0,0 +1,9 @@
+"""
+Tests for the Project README Generation Agent.
+Run from the repository root with: python -m unittest discover -s tests -t .
+"""
+import os
+import sys
+
+# The app package lives in src/, which is not installed
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
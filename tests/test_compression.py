@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from app.agents import READMEAgent
+from app.compression import compress_context, compress_tree, count_tokens, format_file_block
+from app.models import FileSummary
+
+def _rendered_tokens(summaries: list) -> int:
+    return sum(count_tokens(format_file_block(summary)) + 1 for summary in summaries)
+
+class CompressContextTest(unittest.TestCase):
+    def test_high_priority_file_is_shrunk_before_lower_priority_files(self):
+        readme = FileSummary("README.md", ".md", "word " * 1500)
+        data = [FileSummary(f"d{i}.json", ".json", '{"a": 1, "b": 2}') for i in range(20)]
+
+        kept = compress_context([readme] + data, 1000)
+
+        self.assertEqual(kept[0].path, "README.md")
+        self.assertTrue(kept[0].content.endswith("... [Content Truncated] ..."))
+        self.assertLessEqual(_rendered_tokens(kept), 1000)
+
+    def test_headers_count_against_the_budget(self):
+        summaries = [FileSummary(f"pkg/module_{i}.py", ".py", "x = 1") for i in range(50)]
+        content_only = sum(count_tokens(summary.content) for summary in summaries)
+        budget = content_only + 10
+
+        kept = compress_context(summaries, budget)
+
+        self.assertLess(len(kept), len(summaries))
+        self.assertLessEqual(_rendered_tokens(kept), budget)
+
+    def test_everything_fits_returns_summaries_unchanged(self):
+        summaries = [FileSummary("a.py", ".py", "x = 1")]
+        self.assertIs(compress_context(summaries, 1000), summaries)
+
+class CompressTreeTest(unittest.TestCase):
+    def test_deep_levels_collapse_to_fit(self):
+        lines = []
+        for i in range(30):
+            lines.append(f"├── pkg{i}")
+            lines += [f"│   ├── module_{j}.py" for j in range(50)]
+        tree = "\n".join(lines)
+
+        compressed = compress_tree(tree, 300)
+
+        self.assertLessEqual(count_tokens(compressed), 300)
+        self.assertIn("│   └── … 50 more entries", compressed)
+
+    def test_top_level_is_cut_when_collapsing_is_not_enough(self):
+        tree = "\n".join(f"├── file_{i}.py" for i in range(500))
+
+        compressed = compress_tree(tree, 100)
+
+        self.assertLessEqual(count_tokens(compressed), 100)
+        self.assertTrue(compressed.endswith("more entries"))
+
+class AgentBudgetTest(unittest.TestCase):
+    def test_prompt_context_stays_within_token_budget(self):
+        with tempfile.TemporaryDirectory() as project:
+            for i in range(20):
+                os.makedirs(os.path.join(project, f"pkg{i}"))
+                for j in range(20):
+                    with open(os.path.join(project, f"pkg{i}", f"module_{j}.py"), "w", encoding="utf-8") as f:
+                        f.write(f"VALUE_{j} = {j}\n" * 20)
+
+            agent = READMEAgent(project, token_budget=2000, use_cache=False, local=False)
+            tree, summaries = agent._gather()
+            context = agent._get_context(tree, summaries)
+
+        self.assertTrue(summaries)
+        self.assertLessEqual(count_tokens(context), 2000)
+
+if __name__ == "__main__":
+    unittest.main()
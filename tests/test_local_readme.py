@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from app.agents import LocalREADMEGenerator
+from app.tools import scan_project
+
+def _section(readme: str, title: str) -> str:
+    """Returns the body of a '## title' section, up to the next section."""
+    body = readme.split(f"## {title}\n", 1)[1]
+    return body.split("\n## ", 1)[0]
+
+class LocalREADMEGeneratorTest(unittest.TestCase):
+    def _generate(self, files: dict) -> str:
+        with tempfile.TemporaryDirectory() as project:
+            for name, content in files.items():
+                with open(os.path.join(project, name), "w", encoding="utf-8") as f:
+                    f.write(content)
+            tree, summaries = scan_project(project, 5000)
+            return LocalREADMEGenerator(project, tree, summaries).generate()
+
+    def test_requirements_drive_tech_stack_and_installation(self):
+        readme = self._generate({
+            "requirements.txt": "python-dotenv\ngoogle-genai>=1.0\nPyYAML==6.0\n",
+            "main.py": (
+                '"""Entry point."""\n'
+                "import yaml\n"
+                "from dotenv import load_dotenv\n"
+                "from google import genai\n"
+                'if __name__ == "__main__":\n'
+                "    pass\n"
+            ),
+        })
+
+        stack = [line[2:] for line in _section(readme, "Tech Stack").splitlines() if line.startswith("- ")]
+        self.assertEqual(stack, ["Python", "google-genai", "python-dotenv", "PyYAML"])
+
+        installation = _section(readme, "Installation")
+        self.assertIn("pip install -r requirements.txt", installation)
+        self.assertNotIn("yaml", installation)
+
+    def test_no_manifest_lists_imports_without_install_command(self):
+        readme = self._generate({"main.py": "import requests\nimport yaml\nimport os\n"})
+
+        installation = _section(readme, "Installation")
+        self.assertNotIn("pip install", readme)
+        self.assertIn("- `requests`", installation)
+        self.assertIn("- `yaml`", installation)
+        self.assertNotIn("`os`", installation)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,20 @@
+import os
+import tempfile
+import unittest
+
+from app.tools import get_file_summaries
+
+class SelectFilesTest(unittest.TestCase):
+    def test_deep_python_modules_compete_by_depth(self):
+        with tempfile.TemporaryDirectory() as project:
+            os.makedirs(os.path.join(project, "deep", "a", "b"))
+            for path in ("README.md", "NOTES.md", "cli.py", os.path.join("deep", "a", "b", "z.py")):
+                with open(os.path.join(project, path), "w", encoding="utf-8") as f:
+                    f.write("x\n")
+
+            summaries = get_file_summaries(project, 100, max_files=3)
+
+        self.assertEqual([s.path for s in summaries], ["NOTES.md", "README.md", "cli.py"])
+
+if __name__ == "__main__":
+    unittest.main()